@@ -4,15 +4,16 @@ Command-line interface for MapToPoster.
 Thin wrapper around the maptoposter library.
 """
 
-import os
 import sys
 import argparse
-import json
 
-# Import from library
-from maptoposter import create_poster, list_themes, load_theme
+# The CLI only writes files, so skip the GUI backend probe. The library
+# itself leaves the caller's backend alone.
+import matplotlib
+matplotlib.use('Agg')
 
-THEMES_DIR = "themes"
+# Import from library
+from maptoposter import create_poster, list_themes, load_all_themes, load_theme
 
 def print_examples():
     """Print usage examples."""
@@ -36,6 +37,9 @@ Options:
   --country, -C     Country name (required)
   --theme, -t       Theme name (default: feature_based)
   --distance, -d    Map radius in meters (default: 29000)
+  --palette         Quantize PNG to N colors, ~3x smaller but ~3x slower to save
+  --render-dpi      Draw at lower DPI and upscale, e.g. 150 for quick drafts
+  --no-cache        Render from scratch without using posters/.cache
   --list-themes     List all available themes
 """)
 
@@ -47,18 +51,15 @@ def list_themes_cli():
         print("No themes found in 'themes/' directory.")
         return
     
+    # Unreadable themes are still listed by id, with no description
+    loaded_themes = load_all_themes()
+    
     print("\nAvailable Themes:")
     print("-" * 60)
     for theme_name in available_themes:
-        theme_path = os.path.join(THEMES_DIR, f"{theme_name}.json")
-        try:
-            with open(theme_path, 'r') as f:
-                theme_data = json.load(f)
-                display_name = theme_data.get('name', theme_name)
-                description = theme_data.get('description', '')
-        except:
-            display_name = theme_name
-            description = ''
+        theme_data = loaded_themes.get(theme_name, {})
+        display_name = theme_data.get('name', theme_name)
+        description = theme_data.get('description', '')
         print(f"  {theme_name}")
         print(f"    {display_name}")
         if description:
@@ -83,6 +84,9 @@ Examples:
     parser.add_argument('--country', '-C', type=str, help='Country name')
     parser.add_argument('--theme', '-t', type=str, default='feature_based', help='Theme name (default: feature_based)')
     parser.add_argument('--distance', '-d', type=int, default=29000, help='Map radius in meters (default: 29000)')
+    parser.add_argument('--palette', type=int, default=0, help='Quantize the PNG to N colors, e.g. 64, for a ~3x smaller file at ~3x the save time (default: 0, off)')
+    parser.add_argument('--render-dpi', type=int, default=None, help='Draw at this DPI and upscale to 300 for faster, slightly softer renders (default: draw at 300)')
+    parser.add_argument('--no-cache', action='store_true', help='Always render from scratch; do not read or write posters/.cache')
     parser.add_argument('--list-themes', action='store_true', help='List all available themes')
     
     args = parser.parse_args()
@@ -129,7 +133,10 @@ Examples:
             dist=args.distance,
             dpi=300,
             network_type='all',
-            verbose=True
+            verbose=True,
+            palette=args.palette,
+            render_dpi=args.render_dpi,
+            use_cache=not args.no_cache
         )
         
         print("\n" + "=" * 50)
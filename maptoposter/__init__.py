@@ -7,14 +7,18 @@ A library for creating minimalist map posters from OpenStreetMap data.
 from .generator import (
     load_theme,
     list_themes,
+    load_all_themes,
     get_coordinates,
     create_poster,
+    create_posters,
 )
 
 __version__ = "1.0.0"
 __all__ = [
     "load_theme",
     "list_themes",
+    "load_all_themes",
     "get_coordinates",
     "create_poster",
+    "create_posters",
 ]
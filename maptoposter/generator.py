@@ -3,20 +3,67 @@ Core generator module for creating map posters.
 """
 
 import osmnx as ox
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.font_manager import FontProperties
 import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
 import numpy as np
+from PIL import Image
 from geopy.geocoders import Nominatim
 from tqdm import tqdm
 import time
+import threading
+import io
 import json
 import os
+import hashlib
+import shutil
 from datetime import datetime
+from functools import lru_cache
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 THEMES_DIR = "themes"
 FONTS_DIR = "fonts"
 POSTERS_DIR = "posters"
+POSTER_SIZE = (12, 16)  # inches
+MIN_EDGE_PX = 0.5
+GEOCODE_CACHE_FILE = os.path.join(POSTERS_DIR, ".geocode_cache.json")
+RENDER_CACHE_DIR = os.path.join(POSTERS_DIR, ".cache")
+# Bump whenever rendering changes so stale cached posters are not reused
+RENDER_CACHE_VERSION = 1
+
+# Road hierarchy: OSM highway tag -> category index into the lookup tables below
+HIGHWAY_TO_CAT = {
+    'motorway': 0, 'motorway_link': 0,
+    'trunk': 1, 'trunk_link': 1, 'primary': 1, 'primary_link': 1,
+    'secondary': 2, 'secondary_link': 2,
+    'tertiary': 3, 'tertiary_link': 3,
+    'residential': 4, 'living_street': 4, 'unclassified': 4,
+}
+ROAD_DEFAULT_CAT = 5
+ROAD_COLOR_KEYS = ('road_motorway', 'road_primary', 'road_secondary',
+                   'road_tertiary', 'road_residential', 'road_default')
+ROAD_WIDTHS = np.array([1.2, 1.0, 0.8, 0.6, 0.4, 0.4])
+
+# Dedicated single worker for image encoding/writing so saves overlap downloads
+_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="maptoposter-io")
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_INTERVAL = 1.0
+
+_geocode_cache = None
+_geocode_lock = threading.Lock()
+_nominatim_lock = threading.Lock()
+_last_geocode_ts = float('-inf')
+
+# OSMnx settings must be applied before the first Overpass request is made,
+# otherwise the initial downloads bypass the on-disk cache.
+ox.settings.use_cache = True
+ox.settings.cache_folder = os.environ.get("OSMNX_CACHE", os.path.join(POSTERS_DIR, ".osmcache"))
+ox.settings.log_console = False
+ox.settings.requests_timeout = 180
+ox.settings.overpass_rate_limit = True
 
 
 def load_fonts():
@@ -38,6 +85,42 @@ def load_fonts():
     return fonts
 
 
+FontBundle = namedtuple('FontBundle', ['main', 'top', 'sub', 'coords', 'attr'])
+
+
+@lru_cache(maxsize=1)
+def _roboto_font_props(bold, regular, light):
+    """
+    Build the Roboto FontProperties for the given font paths.
+    Cached so repeated posters share one set of objects.
+    """
+    return FontBundle(
+        main=FontProperties(fname=bold, size=60),
+        top=FontProperties(fname=bold, size=40),
+        sub=FontProperties(fname=light, size=22),
+        coords=FontProperties(fname=regular, size=14),
+        attr=FontProperties(fname=light, size=8),
+    )
+
+
+def get_font_props():
+    """
+    Return the poster's FontProperties as a FontBundle.
+    Falls back to monospace if the Roboto fonts are missing; the fallback
+    isn't cached, so fonts that appear later are picked up.
+    """
+    fonts = load_fonts()
+    if fonts:
+        return _roboto_font_props(fonts['bold'], fonts['regular'], fonts['light'])
+    return FontBundle(
+        main=FontProperties(family='monospace', weight='bold', size=60),
+        top=FontProperties(family='monospace', weight='bold', size=40),
+        sub=FontProperties(family='monospace', weight='normal', size=22),
+        coords=FontProperties(family='monospace', size=14),
+        attr=FontProperties(family='monospace', size=8),
+    )
+
+
 def list_themes():
     """
     Returns a list of available theme names from the themes directory.
@@ -45,11 +128,23 @@ def list_themes():
     if not os.path.exists(THEMES_DIR):
         return []
     
-    themes = []
-    for file in sorted(os.listdir(THEMES_DIR)):
-        if file.endswith('.json'):
-            theme_name = file[:-5]  # Remove .json extension
-            themes.append(theme_name)
+    with os.scandir(THEMES_DIR) as entries:
+        return sorted(entry.name[:-5] for entry in entries
+                      if entry.name.endswith('.json') and entry.is_file())
+
+
+def load_all_themes():
+    """
+    Load every theme in the themes directory, parsing each file once.
+    Themes that can't be read are skipped with a warning.
+    Returns a dict mapping theme name to theme dict, sorted by name.
+    """
+    themes = {}
+    for theme_name in list_themes():
+        try:
+            themes[theme_name] = load_theme(theme_name)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read theme '{theme_name}': {e}")
     return themes
 
 
@@ -58,6 +153,15 @@ def load_theme(theme_name="feature_based"):
     Load theme from JSON file in themes directory.
     Returns a dict with theme colors and metadata.
     """
+    # Return a copy so callers can't mutate the cached theme
+    return dict(_load_theme_cached(theme_name))
+
+
+@lru_cache(maxsize=64)
+def _load_theme_cached(theme_name):
+    """
+    Parse a theme file once per process.
+    """
     theme_file = os.path.join(THEMES_DIR, f"{theme_name}.json")
     
     if not os.path.exists(theme_file):
@@ -82,47 +186,102 @@ def load_theme(theme_name="feature_based"):
         return theme
 
 
+def _geocode_cache_key(city, country):
+    """
+    Normalized cache key for a (city, country) pair.
+    """
+    return f"{city.strip().lower()}|{country.strip().lower()}"
+
+
+def _load_geocode_cache():
+    """
+    Lazily load the geocode cache from disk.
+    """
+    global _geocode_cache
+    if _geocode_cache is None:
+        try:
+            with open(GEOCODE_CACHE_FILE, 'r') as f:
+                _geocode_cache = json.load(f)
+        except (OSError, ValueError):
+            _geocode_cache = {}
+    return _geocode_cache
+
+
+def _save_geocode_cache():
+    """
+    Write the geocode cache to disk.
+    """
+    os.makedirs(os.path.dirname(GEOCODE_CACHE_FILE) or '.', exist_ok=True)
+    tmp_file = f"{GEOCODE_CACHE_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(_geocode_cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, GEOCODE_CACHE_FILE)
+
+
+def _geocode_nominatim(query):
+    """
+    Run a Nominatim query, sleeping only if the previous real request
+    was less than NOMINATIM_MIN_INTERVAL seconds ago.
+    """
+    global _last_geocode_ts
+    with _nominatim_lock:
+        wait = NOMINATIM_MIN_INTERVAL - (time.monotonic() - _last_geocode_ts)
+        if wait > 0:
+            time.sleep(wait)
+        
+        geolocator = Nominatim(user_agent="city_map_poster")
+        try:
+            return geolocator.geocode(query)
+        finally:
+            _last_geocode_ts = time.monotonic()
+
+
 def get_coordinates(city, country):
     """
     Fetches coordinates for a given city and country using geopy.
+    Results are cached on disk, so repeat lookups skip Nominatim entirely.
     Returns (latitude, longitude) tuple.
     """
-    geolocator = Nominatim(user_agent="city_map_poster")
+    key = _geocode_cache_key(city, country)
     
-    # Add a small delay to respect Nominatim's usage policy
-    time.sleep(1)
+    # Cache hits never wait on the rate limiter or an in-flight request
+    with _geocode_lock:
+        cached = _load_geocode_cache().get(key)
+    if cached is not None:
+        return tuple(cached)
     
-    location = geolocator.geocode(f"{city}, {country}")
+    location = _geocode_nominatim(f"{city}, {country}")
     
-    if location:
-        return (location.latitude, location.longitude)
-    else:
+    if not location:
         raise ValueError(f"Could not find coordinates for {city}, {country}")
+    
+    coords = (location.latitude, location.longitude)
+    with _geocode_lock:
+        _load_geocode_cache()[key] = list(coords)
+        try:
+            _save_geocode_cache()
+        except OSError:
+            pass
+    
+    return coords
 
 
 def create_gradient_fade(ax, color, location='bottom', zorder=10):
     """
     Creates a fade effect at the top or bottom of the map.
     """
-    vals = np.linspace(0, 1, 256).reshape(-1, 1)
-    gradient = np.hstack((vals, vals))
-    
-    rgb = mcolors.to_rgb(color)
-    my_colors = np.zeros((256, 4))
-    my_colors[:, 0] = rgb[0]
-    my_colors[:, 1] = rgb[1]
-    my_colors[:, 2] = rgb[2]
+    # Single-column RGBA ramp; imshow stretches it across the axes
+    rgba = np.empty((256, 1, 4), dtype=np.float32)
+    rgba[..., :3] = mcolors.to_rgb(color)
     
     if location == 'bottom':
-        my_colors[:, 3] = np.linspace(1, 0, 256)
+        rgba[..., 3] = np.linspace(1, 0, 256)[:, None]
         extent_y_start = 0
         extent_y_end = 0.25
     else:
-        my_colors[:, 3] = np.linspace(0, 1, 256)
+        rgba[..., 3] = np.linspace(0, 1, 256)[:, None]
         extent_y_start = 0.75
         extent_y_end = 1.0
-
-    custom_cmap = mcolors.ListedColormap(my_colors)
     
     xlim = ax.get_xlim()
     ylim = ax.get_ylim()
@@ -131,101 +290,110 @@ def create_gradient_fade(ax, color, location='bottom', zorder=10):
     y_bottom = ylim[0] + y_range * extent_y_start
     y_top = ylim[0] + y_range * extent_y_end
     
-    ax.imshow(gradient, extent=[xlim[0], xlim[1], y_bottom, y_top], 
-              aspect='auto', cmap=custom_cmap, zorder=zorder, origin='lower')
+    ax.imshow(rgba, extent=[xlim[0], xlim[1], y_bottom, y_top], 
+              aspect='auto', zorder=zorder, origin='lower', interpolation='bilinear')
 
 
-def get_edge_colors_by_type(G, theme):
+def _edge_categories(G):
     """
-    Assigns colors to edges based on road type hierarchy.
-    Returns a list of colors corresponding to each edge in the graph.
+    Maps each edge's highway tag to a road category index.
+    Returns an int8 array aligned with G.edges() order.
     """
-    edge_colors = []
-    
-    for u, v, data in G.edges(data=True):
-        # Get the highway type (can be a list or string)
-        highway = data.get('highway', 'unclassified')
-        
+    # A plain loop with a bound dict lookup beats building an object
+    # array and mapping it; iterating the graph is the dominant cost
+    lookup = HIGHWAY_TO_CAT.get
+    cats = []
+    append = cats.append
+    for _, _, highway in G.edges(data='highway', default='unclassified'):
         # Handle list of highway types (take the first one)
-        if isinstance(highway, list):
+        if type(highway) is list:
             highway = highway[0] if highway else 'unclassified'
-        
-        # Assign color based on road type
-        if highway in ['motorway', 'motorway_link']:
-            color = theme['road_motorway']
-        elif highway in ['trunk', 'trunk_link', 'primary', 'primary_link']:
-            color = theme['road_primary']
-        elif highway in ['secondary', 'secondary_link']:
-            color = theme['road_secondary']
-        elif highway in ['tertiary', 'tertiary_link']:
-            color = theme['road_tertiary']
-        elif highway in ['residential', 'living_street', 'unclassified']:
-            color = theme['road_residential']
-        else:
-            color = theme['road_default']
-        
-        edge_colors.append(color)
-    
-    return edge_colors
+        append(lookup(highway, ROAD_DEFAULT_CAT))
+    return np.array(cats, dtype=np.int8)
 
 
-def get_edge_widths_by_type(G):
+def get_edge_styles(G, theme):
     """
-    Assigns line widths to edges based on road type.
-    Major roads get thicker lines.
+    Assigns colors and line widths to edges based on road type hierarchy.
+    Major roads get thicker lines. The edges are traversed only once.
+    Returns (colors, widths) lists corresponding to each edge in the graph.
     """
-    edge_widths = []
-    
-    for u, v, data in G.edges(data=True):
-        highway = data.get('highway', 'unclassified')
-        
-        if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
-        
-        # Assign width based on road importance
-        if highway in ['motorway', 'motorway_link']:
-            width = 1.2
-        elif highway in ['trunk', 'trunk_link', 'primary', 'primary_link']:
-            width = 1.0
-        elif highway in ['secondary', 'secondary_link']:
-            width = 0.8
-        elif highway in ['tertiary', 'tertiary_link']:
-            width = 0.6
-        else:
-            width = 0.4
-        
-        edge_widths.append(width)
-    
-    return edge_widths
+    cats = _edge_categories(G)
+    color_lut = np.array([theme[key] for key in ROAD_COLOR_KEYS], dtype=object)
+    return color_lut[cats].tolist(), ROAD_WIDTHS[cats].tolist()
 
 
-def create_poster(city, country, theme, dist=29000, output_path=None, 
-                  dpi=300, network_type='all', verbose=True):
+def _fetch_osm(coords, dist, network_type, pbar=None):
     """
-    Create a map poster for a given city.
-    
-    Args:
-        city: City name
-        country: Country name
-        theme: Theme name or theme dict
-        dist: Map radius in meters (default: 29000)
-        output_path: Output file path (default: auto-generate in posters/)
-        dpi: DPI for output image (default: 300)
-        network_type: OSMnx network type (default: 'all')
-        verbose: Print progress messages (default: True)
-    
-    Returns:
-        str: Path to the generated poster file
+    Download street network, water and parks concurrently.
+    The requests are I/O-bound, so total time is roughly that of the slowest one.
+    Returns (G, water, parks); water/parks are None if their download fails.
+    """
+    labels = {
+        'graph': "Downloaded street network",
+        'water': "Downloaded water features",
+        'parks': "Downloaded parks/green spaces",
+    }
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(ox.graph_from_point, coords, dist=dist, dist_type='bbox',
+                            network_type=network_type): 'graph',
+            executor.submit(ox.features_from_point, coords,
+                            tags={'natural': 'water', 'waterway': 'riverbank'}, dist=dist): 'water',
+            executor.submit(ox.features_from_point, coords,
+                            tags={'leisure': 'park', 'landuse': 'grass'}, dist=dist): 'parks',
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            if key == 'graph':
+                results[key] = future.result()
+            else:
+                try:
+                    results[key] = future.result()
+                except Exception:
+                    results[key] = None
+            if pbar is not None:
+                pbar.set_description(labels[key])
+                pbar.update(1)
+    
+    return results['graph'], results['water'], results['parks']
+
+
+def _resolve_theme(theme):
+    """
+    Load theme if string provided.
+    Returns (theme_data, theme_name).
     """
-    # Load theme if string provided
     if isinstance(theme, str):
-        theme_data = load_theme(theme)
-        theme_name = theme
-    else:
-        theme_data = theme
-        theme_name = theme.get('name', 'custom')
-    
-    # Get coordinates
+        return load_theme(theme), theme
+    return theme, theme.get('name', 'custom')
+
+
+def _default_output_path(city, theme_name, taken=()):
+    """
+    Generate an output filename in POSTERS_DIR.
+    A numeric suffix is added if the name already exists on disk or is
+    in `taken` (paths already handed out but possibly not yet written).
+    """
+    if not os.path.exists(POSTERS_DIR):
+        os.makedirs(POSTERS_DIR)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    city_slug = city.lower().replace(' ', '_')
+    stem = f"{city_slug}_{theme_name}_{timestamp}"
+    output_path = os.path.join(POSTERS_DIR, f"{stem}.png")
+    suffix = 2
+    while output_path in taken or os.path.exists(output_path):
+        output_path = os.path.join(POSTERS_DIR, f"{stem}_{suffix}.png")
+        suffix += 1
+    return output_path
+
+
+def _lookup_coordinates(city, country, verbose):
+    """
+    Geocode the city, printing progress if requested.
+    """
     if verbose:
         print(f"\nGenerating map for {city}, {country}...")
         print("Looking up coordinates...")
@@ -235,58 +403,191 @@ def create_poster(city, country, theme, dist=29000, output_path=None,
     if verbose:
         print(f"✓ Found coordinates: {coords[0]:.4f}, {coords[1]:.4f}")
     
-    # Generate output filename if not provided
-    if output_path is None:
-        if not os.path.exists(POSTERS_DIR):
-            os.makedirs(POSTERS_DIR)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        city_slug = city.lower().replace(' ', '_')
-        filename = f"{city_slug}_{theme_name}_{timestamp}.png"
-        output_path = os.path.join(POSTERS_DIR, filename)
-    
-    # Fetch map data
+    return coords
+
+
+def _fetch_map_data(coords, dist, network_type, verbose):
+    """
+    Download the map data around coords.
+    Returns (G, water, parks).
+    """
     if verbose:
         pbar = tqdm(total=3, desc="Fetching map data", unit="step", 
                    bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}')
+    else:
+        pbar = None
     
-    # 1. Fetch Street Network
-    if verbose:
-        pbar.set_description("Downloading street network")
-    G = ox.graph_from_point(coords, dist=dist, dist_type='bbox', network_type=network_type)
-    if verbose:
-        pbar.update(1)
-    time.sleep(0.5)
+    G, water, parks = _fetch_osm(coords, dist, network_type, pbar=pbar)
     
-    # 2. Fetch Water Features
     if verbose:
-        pbar.set_description("Downloading water features")
-    try:
-        water = ox.features_from_point(coords, tags={'natural': 'water', 'waterway': 'riverbank'}, dist=dist)
-    except Exception:
-        water = None
-    if verbose:
-        pbar.update(1)
-    time.sleep(0.3)
-    
-    # 3. Fetch Parks
-    if verbose:
-        pbar.set_description("Downloading parks/green spaces")
-    try:
-        parks = ox.features_from_point(coords, tags={'leisure': 'park', 'landuse': 'grass'}, dist=dist)
-    except Exception:
-        parks = None
-    if verbose:
-        pbar.update(1)
         pbar.close()
         print("✓ All data downloaded successfully!")
     
-    # Setup plot
+    return G, water, parks
+
+
+def _render_cache_path(city, country, coords, dist, network_type, theme_data, dpi,
+                       simplify_level=0, palette=0, render_dpi=None, ext='.png'):
+    """
+    Path of the cached poster for this exact set of inputs.
+    The key hashes everything that affects the rendered image.
+    """
+    render_dpi = _effective_render_dpi(dpi, render_dpi)
+    key_data = [RENDER_CACHE_VERSION, city, country, round(coords[0], 4), round(coords[1], 4),
+                dist, network_type, dpi, theme_data, simplify_level, palette, render_dpi]
+    key = hashlib.blake2b(json.dumps(key_data, sort_keys=True).encode(),
+                          digest_size=16).hexdigest()
+    return os.path.join(RENDER_CACHE_DIR, f"{key}{ext}")
+
+
+def _copy_from_cache(cache_path, output_path, verbose):
+    """
+    Copy a cached poster to output_path if one exists.
+    A cache_path of None means caching is disabled.
+    Returns True on a cache hit.
+    """
+    if cache_path is None or not os.path.exists(cache_path):
+        return False
+    shutil.copyfile(cache_path, output_path)
     if verbose:
-        print("Rendering map...")
+        print(f"✓ Reused cached render. Poster saved as {output_path}")
+    return True
+
+
+def _store_in_cache(output_path, cache_path):
+    """
+    Copy a freshly rendered poster into the render cache.
+    The copy goes to a temp file first so a failed or concurrent write
+    never leaves a truncated poster at cache_path.
+    """
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def reduce_graph(G, dist, dpi, simplify_level=1):
+    """
+    Drop detail that would be invisible at the output resolution.
+    
+    Levels:
+        0: no change
+        1: remove edges shorter than MIN_EDGE_PX pixels
+        2: also merge intersections closer than 15 m first
+    
+    Returns the reduced graph (unprojected, like the input).
+    """
+    if simplify_level >= 2:
+        simplified = G.graph.get('simplified', False)
+        G = ox.project_graph(G)
+        G = ox.consolidate_intersections(G, tolerance=15, rebuild_graph=True, dead_ends=False)
+        # project_graph only reprojects edge geometries on simplified graphs,
+        # but consolidation gives edges projected geometries either way
+        G.graph['simplified'] = True
+        G = ox.project_graph(G, to_latlong=True)
+        G.graph['simplified'] = simplified
+    
+    if simplify_level >= 1:
+        # The bbox spans 2 * dist meters across the poster's width
+        px_per_m = POSTER_SIZE[0] * dpi / (2 * dist)
+        min_length = MIN_EDGE_PX / px_per_m
+        short_edges = [(u, v, k) for u, v, k, length in G.edges(keys=True, data='length')
+                       if length is not None and length < min_length]
+        G.remove_edges_from(short_edges)
+    
+    return G
+
+
+def _new_figure(theme_data):
+    """
+    Create the full-bleed poster figure and axes.
+    """
+    # A bare Figure isn't registered with pyplot or any GUI backend, so it
+    # can be drawn and saved from the I/O thread and needs no plt.close
+    fig = Figure(figsize=POSTER_SIZE, facecolor=theme_data['bg'])
+    ax = fig.add_axes([0, 0, 1, 1])
+    return fig, ax
+
+
+def _edge_segments(G):
+    """
+    Builds one polyline per edge, aligned with G.edges() order.
+    Straight edges are looked up from node coordinate arrays in one
+    vectorized step; edges with a 'geometry' use its coordinates.
+    Returns a list of (n, 2) coordinate arrays.
+    """
+    node_idx = {}
+    node_xy = np.empty((G.number_of_nodes(), 2), dtype=np.float64)
+    for i, (node, data) in enumerate(G.nodes(data=True)):
+        node_idx[node] = i
+        node_xy[i] = data['x'], data['y']
+    
+    segments = []
+    straight, us, vs = [], [], []
+    for i, (u, v, geometry) in enumerate(G.edges(data='geometry')):
+        if geometry is None:
+            segments.append(None)
+            straight.append(i)
+            us.append(node_idx[u])
+            vs.append(node_idx[v])
+        else:
+            segments.append(np.asarray(geometry.coords))
     
-    fig, ax = plt.subplots(figsize=(12, 16), facecolor=theme_data['bg'])
+    if straight:
+        straight_xy = node_xy[np.stack([us, vs], axis=1)]
+        for i, xy in zip(straight, straight_xy):
+            segments[i] = xy
+    
+    return segments
+
+
+def _plot_roads(ax, G, edge_colors, edge_widths):
+    """
+    Draws the road network as a single rasterized LineCollection and
+    frames the axes around it, as ox.plot_graph would.
+    """
+    segments = _edge_segments(G)
+    if not segments:
+        return
+    
+    # Rasterized: one image for the roads instead of a vector path per
+    # edge; text stays vector for PDF/SVG output
+    roads = LineCollection(segments, colors=edge_colors, linewidths=edge_widths,
+                           rasterized=True, zorder=1)
+    ax.add_collection(roads)
+    
+    # View limits: road extent plus 2% padding
+    all_xy = np.concatenate(segments)
+    left, bottom = all_xy.min(axis=0)
+    right, top = all_xy.max(axis=0)
+    padding_ew = (right - left) * 0.02
+    padding_ns = (top - bottom) * 0.02
+    ax.set_xlim((left - padding_ew, right + padding_ew))
+    ax.set_ylim((bottom - padding_ns, top + padding_ns))
+    
+    # No border, ticks or axis; keep lat/lon from looking stretched
+    ax.margins(0)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.get_xaxis().set_visible(False)
+    ax.get_yaxis().set_visible(False)
+    if ox.projection.is_projected(G.graph['crs']):
+        ax.set_aspect('equal')
+    else:
+        ax.set_aspect(1 / np.cos(np.deg2rad((bottom + top) / 2)))
+
+
+def _render_on_axes(ax, theme_data, G, water, parks, city, country, coords):
+    """
+    Draw all poster layers onto an existing (empty) axes.
+    """
     ax.set_facecolor(theme_data['bg'])
-    ax.set_position([0, 0, 1, 1])
     
     # Plot layers
     if water is not None and not water.empty:
@@ -295,44 +596,25 @@ def create_poster(city, country, theme, dist=29000, output_path=None,
         parks.plot(ax=ax, facecolor=theme_data['parks'], edgecolor='none', zorder=2)
     
     # Roads with hierarchy coloring
-    edge_colors = get_edge_colors_by_type(G, theme_data)
-    edge_widths = get_edge_widths_by_type(G)
-    
-    ox.plot_graph(
-        G, ax=ax, bgcolor=theme_data['bg'],
-        node_size=0,
-        edge_color=edge_colors,
-        edge_linewidth=edge_widths,
-        show=False, close=False
-    )
+    edge_colors, edge_widths = get_edge_styles(G, theme_data)
+    
+    _plot_roads(ax, G, edge_colors, edge_widths)
     
     # Gradients
     create_gradient_fade(ax, theme_data['gradient_color'], location='bottom', zorder=10)
     create_gradient_fade(ax, theme_data['gradient_color'], location='top', zorder=10)
     
     # Typography
-    fonts = load_fonts()
-    if fonts:
-        font_main = FontProperties(fname=fonts['bold'], size=60)
-        font_top = FontProperties(fname=fonts['bold'], size=40)
-        font_sub = FontProperties(fname=fonts['light'], size=22)
-        font_coords = FontProperties(fname=fonts['regular'], size=14)
-        font_attr = FontProperties(fname=fonts['light'], size=8)
-    else:
-        font_main = FontProperties(family='monospace', weight='bold', size=60)
-        font_top = FontProperties(family='monospace', weight='bold', size=40)
-        font_sub = FontProperties(family='monospace', weight='normal', size=22)
-        font_coords = FontProperties(family='monospace', size=14)
-        font_attr = FontProperties(family='monospace', size=8)
+    fonts = get_font_props()
     
     spaced_city = "  ".join(list(city.upper()))
 
     # Bottom text
     ax.text(0.5, 0.14, spaced_city, transform=ax.transAxes,
-            color=theme_data['text'], ha='center', fontproperties=font_main, zorder=11)
+            color=theme_data['text'], ha='center', fontproperties=fonts.main, zorder=11)
     
     ax.text(0.5, 0.10, country.upper(), transform=ax.transAxes,
-            color=theme_data['text'], ha='center', fontproperties=font_sub, zorder=11)
+            color=theme_data['text'], ha='center', fontproperties=fonts.sub, zorder=11)
     
     lat, lon = coords
     coords_text = f"{lat:.4f}° N / {lon:.4f}° E" if lat >= 0 else f"{abs(lat):.4f}° S / {lon:.4f}° E"
@@ -340,7 +622,7 @@ def create_poster(city, country, theme, dist=29000, output_path=None,
         coords_text = coords_text.replace("E", "W")
     
     ax.text(0.5, 0.07, coords_text, transform=ax.transAxes,
-            color=theme_data['text'], alpha=0.7, ha='center', fontproperties=font_coords, zorder=11)
+            color=theme_data['text'], alpha=0.7, ha='center', fontproperties=fonts.coords, zorder=11)
     
     ax.plot([0.4, 0.6], [0.125, 0.125], transform=ax.transAxes, 
             color=theme_data['text'], linewidth=1, zorder=11)
@@ -348,15 +630,186 @@ def create_poster(city, country, theme, dist=29000, output_path=None,
     # Attribution
     ax.text(0.98, 0.02, "© OpenStreetMap contributors", transform=ax.transAxes,
             color=theme_data['text'], alpha=0.5, ha='right', va='bottom', 
-            fontproperties=font_attr, zorder=11)
+            fontproperties=fonts.attr, zorder=11)
+
+
+def _effective_render_dpi(dpi, render_dpi):
+    """
+    DPI matplotlib actually draws at; never above the output DPI.
+    """
+    return dpi if render_dpi is None else min(render_dpi, dpi)
+
+
+def _save_figure(fig, output_path, dpi, facecolor, verbose=False,
+                 cache_path=None, palette=0, render_dpi=None):
+    """
+    Write the figure to disk, optionally storing a copy in the render cache.
+    PNGs drawn at a lower render_dpi are upscaled to dpi with Lanczos,
+    and quantized to a palette of `palette` colors unless it is 0.
+    Returns the output path.
+    """
+    render_dpi = _effective_render_dpi(dpi, render_dpi)
+    if output_path.lower().endswith('.png') and (palette or render_dpi < dpi):
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=render_dpi, facecolor=facecolor)
+        buf.seek(0)
+        with Image.open(buf) as img:
+            img.load()
+        if render_dpi < dpi:
+            size = (round(fig.get_figwidth() * dpi), round(fig.get_figheight() * dpi))
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        if palette:
+            img = img.convert('RGB').quantize(colors=palette, method=Image.Quantize.MEDIANCUT)
+        img.save(output_path, optimize=True, dpi=(dpi, dpi))
+    else:
+        fig.savefig(output_path, dpi=dpi, facecolor=facecolor)
+    if cache_path is not None:
+        _store_in_cache(output_path, cache_path)
+    if verbose:
+        print(f"✓ Done! Poster saved as {output_path}")
+    return output_path
+
+
+def create_poster(city, country, theme, dist=29000, output_path=None, 
+                  dpi=300, network_type='all', verbose=True, async_save=False,
+                  simplify_level=0, palette=0, render_dpi=None, use_cache=True):
+    """
+    Create a map poster for a given city.
+    
+    Args:
+        city: City name
+        country: Country name
+        theme: Theme name or theme dict
+        dist: Map radius in meters (default: 29000)
+        output_path: Output file path (default: auto-generate in posters/)
+        dpi: DPI for output image (default: 300)
+        network_type: OSMnx network type (default: 'all')
+        verbose: Print progress messages (default: True)
+        async_save: Encode and write the image on a background thread
+            and return a Future instead of waiting (default: False)
+        simplify_level: Drop sub-pixel detail before rendering; 0 = none,
+            1 = drop sub-pixel edges, 2 = also merge intersections (default: 0)
+        palette: Quantize PNG output to this many colors for a smaller
+            file; 0 keeps full RGBA (default: 0)
+        render_dpi: Draw at this DPI and Lanczos-upscale the PNG to dpi;
+            faster, slightly softer lines (default: None, draw at dpi)
+        use_cache: Reuse and store renders in the render cache (default: True)
+    
+    Returns:
+        str: Path to the generated poster file, or a Future resolving
+        to it when async_save is True
+    """
+    theme_data, theme_name = _resolve_theme(theme)
+    
+    coords = _lookup_coordinates(city, country, verbose)
+    
+    if output_path is None:
+        output_path = _default_output_path(city, theme_name)
+    
+    # Identical inputs produce an identical poster, so reuse a previous render
+    cache_path = None
+    if use_cache:
+        cache_path = _render_cache_path(city, country, coords, dist, network_type, theme_data,
+                                        dpi, simplify_level=simplify_level, palette=palette,
+                                        render_dpi=render_dpi,
+                                        ext=os.path.splitext(output_path)[1])
+    if _copy_from_cache(cache_path, output_path, verbose):
+        if async_save:
+            future = Future()
+            future.set_result(output_path)
+            return future
+        return output_path
+    
+    G, water, parks = _fetch_map_data(coords, dist, network_type, verbose)
+    G = reduce_graph(G, dist, dpi, simplify_level)
+    
+    # Setup plot
+    if verbose:
+        print("Rendering map...")
+    
+    fig, ax = _new_figure(theme_data)
+    _render_on_axes(ax, theme_data, G, water, parks, city, country, coords)
 
     # Save
     if verbose:
         print(f"Saving to {output_path}...")
-    plt.savefig(output_path, dpi=dpi, facecolor=theme_data['bg'])
-    plt.close()
+    if async_save:
+        return _io_executor.submit(_save_figure, fig, output_path, dpi, theme_data['bg'],
+                                   verbose=verbose, cache_path=cache_path,
+                                   palette=palette, render_dpi=render_dpi)
+    return _save_figure(fig, output_path, dpi, theme_data['bg'], verbose=verbose,
+                        cache_path=cache_path, palette=palette, render_dpi=render_dpi)
+
+
+def create_posters(cities, theme, dist=29000, dpi=300, network_type='all', verbose=True,
+                   simplify_level=0, palette=0, render_dpi=None, use_cache=True):
+    """
+    Create map posters for several cities with the same theme.
+    A single figure is reused for the whole batch instead of being
+    rebuilt for every city, and each poster is saved in the background
+    while the next city's map data downloads.
     
-    if verbose:
-        print(f"✓ Done! Poster saved as {output_path}")
+    Args:
+        cities: List of (city, country) tuples
+        theme: Theme name or theme dict
+        dist: Map radius in meters (default: 29000)
+        dpi: DPI for output images (default: 300)
+        network_type: OSMnx network type (default: 'all')
+        verbose: Print progress messages (default: True)
+        simplify_level: Drop sub-pixel detail before rendering; see
+            create_poster (default: 0)
+        palette: Quantize output to this many colors; 0 keeps full
+            RGBA (default: 0)
+        render_dpi: Draw at this DPI and upscale to dpi; see
+            create_poster (default: None)
+        use_cache: Reuse and store renders in the render cache (default: True)
     
-    return output_path
+    Returns:
+        list: Paths to the generated poster files, in input order
+    """
+    theme_data, theme_name = _resolve_theme(theme)
+    results = []
+    issued_paths = set()
+    pending = None
+    
+    fig, ax = _new_figure(theme_data)
+    try:
+        for city, country in cities:
+            coords = _lookup_coordinates(city, country, verbose)
+            output_path = _default_output_path(city, theme_name, taken=issued_paths)
+            issued_paths.add(output_path)
+            
+            cache_path = None
+            if use_cache:
+                cache_path = _render_cache_path(city, country, coords, dist, network_type,
+                                                theme_data, dpi, simplify_level=simplify_level,
+                                                palette=palette, render_dpi=render_dpi)
+            if _copy_from_cache(cache_path, output_path, verbose):
+                results.append(output_path)
+                continue
+            
+            G, water, parks = _fetch_map_data(coords, dist, network_type, verbose)
+            G = reduce_graph(G, dist, dpi, simplify_level)
+            
+            # The figure is shared, so the previous save must finish first
+            if pending is not None:
+                pending.result()
+            
+            if verbose:
+                print("Rendering map...")
+            ax.clear()
+            _render_on_axes(ax, theme_data, G, water, parks, city, country, coords)
+            
+            if verbose:
+                print(f"Saving to {output_path}...")
+            pending = _io_executor.submit(_save_figure, fig, output_path, dpi, theme_data['bg'],
+                                          verbose=verbose, cache_path=cache_path,
+                                          palette=palette, render_dpi=render_dpi)
+            results.append(pending)
+        
+        output_paths = [r.result() if isinstance(r, Future) else r for r in results]
+    finally:
+        if pending is not None:
+            pending.exception()
+    
+    return output_paths
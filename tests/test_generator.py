@@ -52,11 +52,477 @@ def test_load_nonexistent_theme():
     print("✓ test_load_nonexistent_theme passed - fallback works")
 
 
+def test_load_all_themes():
+    """Test that load_all_themes returns every listed theme."""
+    from maptoposter import load_all_themes
+
+    themes = load_all_themes()
+
+    assert list(themes) == list_themes(), "Should load every theme, in order"
+    assert themes['noir'] == load_theme('noir'), "Should match load_theme"
+
+    print(f"✓ test_load_all_themes passed - loaded {len(themes)} themes")
+
+
+def test_osmnx_settings_applied_on_import():
+    """Test that Overpass caching and rate limiting are on before any request."""
+    from maptoposter import generator
+
+    assert generator.ox.settings.use_cache, "OSMnx cache should be enabled"
+    assert generator.ox.settings.overpass_rate_limit, \
+        "Overpass spacing is left to OSMnx's rate limiter"
+
+    print("✓ test_osmnx_settings_applied_on_import passed")
+
+
+def test_import_keeps_callers_matplotlib_backend():
+    """Test that importing the library doesn't switch matplotlib backends."""
+    import subprocess
+
+    code = ("import matplotlib; matplotlib.use('svg'); import maptoposter; "
+            "print(matplotlib.get_backend())")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=root,
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == 'svg', "Caller's backend should be kept"
+
+    print("✓ test_import_keeps_callers_matplotlib_backend passed")
+
+
+def test_load_all_themes_warns_on_unreadable_theme(monkeypatch, tmp_path, capsys):
+    """Test that a theme that won't parse is skipped with a warning."""
+    from maptoposter import generator
+
+    (tmp_path / 'good.json').write_text('{"name": "Good", "bg": "#FFFFFF"}')
+    (tmp_path / 'broken.json').write_text('{not json')
+    monkeypatch.setattr(generator, 'THEMES_DIR', str(tmp_path))
+    generator._load_theme_cached.cache_clear()
+
+    try:
+        themes = generator.load_all_themes()
+    finally:
+        generator._load_theme_cached.cache_clear()
+
+    assert list(themes) == ['good'], "Only readable themes should be loaded"
+    assert "broken" in capsys.readouterr().out, "Skipped theme should be reported"
+
+    print("✓ test_load_all_themes_warns_on_unreadable_theme passed")
+
+
+def test_fetch_osm_tolerates_missing_features(monkeypatch):
+    """Test that failed water/parks downloads fall back to None."""
+    from maptoposter import generator
+
+    def fake_features(coords, tags, dist):
+        raise RuntimeError("no features")
+
+    monkeypatch.setattr(generator.ox, 'graph_from_point', lambda *a, **kw: 'graph')
+    monkeypatch.setattr(generator.ox, 'features_from_point', fake_features)
+
+    G, water, parks = generator._fetch_osm((0.0, 0.0), 1000, 'all')
+
+    assert G == 'graph', "Street network should be returned"
+    assert water is None and parks is None, "Failed features should be None"
+
+    print("✓ test_fetch_osm_tolerates_missing_features passed")
+
+
+def test_get_coordinates_uses_disk_cache(monkeypatch, tmp_path):
+    """Test that repeat geocodes are served from the disk cache."""
+    from maptoposter import generator
+
+    calls = []
+
+    class FakeLocation:
+        latitude = 48.8566
+        longitude = 2.3522
+
+    class FakeNominatim:
+        def __init__(self, user_agent):
+            pass
+
+        def geocode(self, query):
+            calls.append(query)
+            return FakeLocation()
+
+    monkeypatch.setattr(generator, 'Nominatim', FakeNominatim)
+    monkeypatch.setattr(generator, 'GEOCODE_CACHE_FILE', str(tmp_path / 'geocode.json'))
+    monkeypatch.setattr(generator, '_geocode_cache', None)
+
+    first = generator.get_coordinates('Paris', 'France')
+    monkeypatch.setattr(generator, '_geocode_cache', None)
+    second = generator.get_coordinates(' paris ', 'FRANCE')
+
+    assert first == second == (48.8566, 2.3522), "Cached coordinates should match"
+    assert len(calls) == 1, "Second lookup should not hit Nominatim"
+
+    print("✓ test_get_coordinates_uses_disk_cache passed")
+
+
+def test_geocode_rate_limit_only_sleeps_when_needed(monkeypatch, tmp_path):
+    """Test that Nominatim requests are spaced without a fixed sleep."""
+    from maptoposter import generator
+
+    sleeps = []
+
+    class FakeLocation:
+        latitude = 1.0
+        longitude = 2.0
+
+    class FakeNominatim:
+        def __init__(self, user_agent):
+            pass
+
+        def geocode(self, query):
+            return FakeLocation()
+
+    monkeypatch.setattr(generator, 'Nominatim', FakeNominatim)
+    monkeypatch.setattr(generator.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(generator, 'GEOCODE_CACHE_FILE', str(tmp_path / 'geocode.json'))
+    monkeypatch.setattr(generator, '_geocode_cache', None)
+    monkeypatch.setattr(generator, '_last_geocode_ts', float('-inf'))
+
+    generator.get_coordinates('Oslo', 'Norway')
+    assert sleeps == [], "First request should not sleep"
+
+    generator.get_coordinates('Bergen', 'Norway')
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= generator.NOMINATIM_MIN_INTERVAL
+
+    generator.get_coordinates('Oslo', 'Norway')
+    assert len(sleeps) == 1, "Cache hits should never sleep"
+
+    print("✓ test_geocode_rate_limit_only_sleeps_when_needed passed")
+
+
+def test_edge_styles_follow_road_hierarchy():
+    """Test that edge colors and widths follow the highway hierarchy."""
+    import networkx as nx
+    from maptoposter.generator import get_edge_styles
+
+    G = nx.MultiDiGraph()
+    G.add_edge(1, 2, highway='motorway')
+    G.add_edge(2, 3, highway=['primary', 'secondary'])
+    G.add_edge(3, 4)
+    G.add_edge(4, 5, highway='footway')
+
+    theme = load_theme('noir')
+    colors, widths = get_edge_styles(G, theme)
+
+    assert colors == [theme['road_motorway'], theme['road_primary'],
+                      theme['road_residential'], theme['road_default']]
+    assert widths == [1.2, 1.0, 0.4, 0.4]
+
+    print("✓ test_edge_styles_follow_road_hierarchy passed")
+
+
+def test_edge_segments_use_node_coords_and_geometry():
+    """Test that edge segments come from node coords or edge geometry."""
+    import networkx as nx
+    from shapely.geometry import LineString
+    from maptoposter.generator import _edge_segments
+
+    G = nx.MultiDiGraph()
+    G.add_node('a', x=0.0, y=0.0)
+    G.add_node('b', x=1.0, y=2.0)
+    G.add_edge('a', 'b')
+    G.add_edge('b', 'a', geometry=LineString([(1, 2), (5, 5), (0, 0)]))
+
+    straight, curved = _edge_segments(G)
+
+    assert straight.tolist() == [[0.0, 0.0], [1.0, 2.0]]
+    assert curved.tolist() == [[1.0, 2.0], [5.0, 5.0], [0.0, 0.0]]
+
+    print("✓ test_edge_segments_use_node_coords_and_geometry passed")
+
+
+def test_reduce_graph_drops_subpixel_edges():
+    """Test that edges shorter than half a pixel are removed."""
+    import networkx as nx
+    from maptoposter.generator import reduce_graph
+
+    G = nx.MultiDiGraph()
+    G.add_edge(1, 2, length=2.0)
+    G.add_edge(2, 3, length=500.0)
+    G.add_edge(3, 4)
+
+    # 12in * 300dpi across 2 * 29000m -> edges under ~8m are sub-pixel
+    reduced = reduce_graph(G.copy(), dist=29000, dpi=300, simplify_level=1)
+    assert list(reduced.edges()) == [(2, 3), (3, 4)]
+
+    untouched = reduce_graph(G.copy(), dist=29000, dpi=300, simplify_level=0)
+    assert untouched.number_of_edges() == 3
+
+    print("✓ test_reduce_graph_drops_subpixel_edges passed")
+
+
+def _tiny_map():
+    """Small (G, water, parks) tuple for offline render tests."""
+    import networkx as nx
+
+    G = nx.MultiDiGraph(crs='epsg:4326')
+    G.add_node(1, x=2.0, y=48.0)
+    G.add_node(2, x=2.1, y=48.1)
+    G.add_edge(1, 2, highway='primary')
+    return G, None, None
+
+
+def _offline_generator(monkeypatch, tmp_path):
+    """Point the generator at tmp_path and stub out network access."""
+    from maptoposter import generator
+
+    monkeypatch.setattr(generator, 'POSTERS_DIR', str(tmp_path / 'posters'))
+    monkeypatch.setattr(generator, 'RENDER_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(generator, 'get_coordinates', lambda city, country: (48.0, 2.0))
+    monkeypatch.setattr(generator, '_fetch_map_data', lambda *args, **kwargs: _tiny_map())
+    return generator
+
+
+def test_default_output_path_never_repeats(monkeypatch, tmp_path):
+    """Test that output paths get a suffix when already taken or on disk."""
+    from maptoposter import generator
+
+    monkeypatch.setattr(generator, 'POSTERS_DIR', str(tmp_path))
+
+    first = generator._default_output_path('Paris', 'noir')
+    second = generator._default_output_path('Paris', 'noir', taken={first})
+    open(second, 'w').close()
+    third = generator._default_output_path('Paris', 'noir', taken={first})
+
+    assert len({first, second, third}) == 3, "Output paths should be distinct"
+
+    print("✓ test_default_output_path_never_repeats passed")
+
+
+def test_create_posters_writes_one_file_per_city(monkeypatch, tmp_path):
+    """Test that a batch saves each city to its own file, in order."""
+    import matplotlib.pyplot as plt
+
+    generator = _offline_generator(monkeypatch, tmp_path)
+    open_figures = set(plt.get_fignums())
+
+    cities = [('Paris', 'France'), ('Paris', 'USA'), ('Lyon', 'France')]
+    paths = generator.create_posters(cities, 'noir', dpi=10, verbose=False)
+
+    assert len(paths) == 3 and len(set(paths)) == 3, "Each city needs its own file"
+    assert [os.path.basename(p).split('_')[0] for p in paths] == ['paris', 'paris', 'lyon']
+    assert all(os.path.exists(p) for p in paths), "Every poster should be written"
+    assert set(plt.get_fignums()) == open_figures, "Batch should not register pyplot figures"
+
+    # Warm re-run: cache hits must not overwrite each other either
+    paths = generator.create_posters(cities, 'noir', dpi=10, verbose=False)
+    assert len(set(paths)) == 3 and all(os.path.exists(p) for p in paths)
+
+    print("✓ test_create_posters_writes_one_file_per_city passed")
+
+
+def test_create_poster_async_save_returns_future(monkeypatch, tmp_path):
+    """Test that async_save returns a Future for fresh and cached renders."""
+    from concurrent.futures import Future
+
+    generator = _offline_generator(monkeypatch, tmp_path)
+    output_path = str(tmp_path / 'async.png')
+
+    future = generator.create_poster('Paris', 'France', 'noir', output_path=output_path,
+                                     dpi=10, verbose=False, async_save=True)
+    assert isinstance(future, Future), "async_save should return a Future"
+    assert future.result(timeout=30) == output_path
+    assert os.path.exists(output_path), "Poster should exist once the Future resolves"
+
+    # Same inputs again: served from the render cache as a completed Future
+    cached_path = str(tmp_path / 'async_cached.png')
+    cached = generator.create_poster('Paris', 'France', 'noir', output_path=cached_path,
+                                     dpi=10, verbose=False, async_save=True)
+    assert isinstance(cached, Future) and cached.done(), "Cache hit should be completed"
+    assert cached.result() == cached_path
+    assert os.path.exists(cached_path)
+
+    print("✓ test_create_poster_async_save_returns_future passed")
+
+
+def _tiny_figure():
+    """Small two-colour figure for save tests (2x3 in)."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(2, 3), facecolor='#000000')
+    ax = fig.add_subplot()
+    ax.plot([0, 1], [0, 1], color='#FF0000')
+    return fig
+
+
+def test_save_figure_palette_quantizes_png(tmp_path):
+    """Test that palette=N writes a palette PNG with at most N colours."""
+    from PIL import Image
+    from maptoposter.generator import _save_figure
+
+    output_path = str(tmp_path / 'palette.png')
+    _save_figure(_tiny_figure(), output_path, dpi=20, facecolor='#000000', palette=8)
+
+    with Image.open(output_path) as img:
+        assert img.mode == 'P', "Palette output should be mode P"
+        assert len(img.getcolors()) <= 8, "Should use at most 8 colours"
+
+    print("✓ test_save_figure_palette_quantizes_png passed")
+
+
+def test_save_figure_render_dpi_upscales_to_full_size(tmp_path):
+    """Test that render_dpi < dpi still yields figsize * dpi pixels."""
+    from PIL import Image
+    from maptoposter.generator import _save_figure
+
+    output_path = str(tmp_path / 'upscaled.png')
+    _save_figure(_tiny_figure(), output_path, dpi=40, facecolor='#000000', render_dpi=20)
+
+    with Image.open(output_path) as img:
+        assert img.size == (2 * 40, 3 * 40), "Should be upscaled to the output DPI"
+
+    print("✓ test_save_figure_render_dpi_upscales_to_full_size passed")
+
+
+def test_save_figure_non_png_skips_pil(monkeypatch, tmp_path):
+    """Test that palette/render_dpi are ignored for non-PNG outputs."""
+    from maptoposter import generator
+
+    class NoPIL:
+        def __getattr__(self, name):
+            raise AssertionError("PIL should not be used for non-PNG output")
+
+    monkeypatch.setattr(generator, 'Image', NoPIL())
+
+    output_path = str(tmp_path / 'poster.svg')
+    generator._save_figure(_tiny_figure(), output_path, dpi=40, facecolor='#000000',
+                           palette=8, render_dpi=20)
+
+    assert os.path.getsize(output_path) > 0, "SVG should be written by matplotlib"
+
+    print("✓ test_save_figure_non_png_skips_pil passed")
+
+
+def test_store_in_cache_leaves_no_partial_file(monkeypatch, tmp_path):
+    """Test that a failed cache copy leaves neither the entry nor a temp file."""
+    from maptoposter import generator
+
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(generator, 'RENDER_CACHE_DIR', str(cache_dir))
+    output_path = tmp_path / 'poster.png'
+    output_path.write_bytes(b'poster')
+    cache_path = str(cache_dir / 'key.png')
+
+    def failing_copy(src, dst):
+        with open(dst, 'wb') as f:
+            f.write(b'pos')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(generator.shutil, 'copyfile', failing_copy)
+    generator._store_in_cache(str(output_path), cache_path)
+    assert os.listdir(cache_dir) == [], "Failed copy should leave nothing behind"
+
+    monkeypatch.undo()
+    monkeypatch.setattr(generator, 'RENDER_CACHE_DIR', str(cache_dir))
+    generator._store_in_cache(str(output_path), cache_path)
+    assert os.listdir(cache_dir) == ['key.png']
+
+    print("✓ test_store_in_cache_leaves_no_partial_file passed")
+
+
+def test_reduce_graph_consolidation_stays_in_latlon():
+    """Test that level 2 returns lat/lon edge geometries for any graph."""
+    import networkx as nx
+    from maptoposter.generator import reduce_graph
+
+    G = nx.MultiDiGraph(crs='epsg:4326')
+    for i in range(4):
+        for j in range(4):
+            G.add_node(i * 4 + j, x=2.35 + i * 0.001, y=48.85 + j * 0.001)
+    for i in range(4):
+        for j in range(3):
+            G.add_edge(i * 4 + j, i * 4 + j + 1, length=74.0)
+            G.add_edge(j * 4 + i, (j + 1) * 4 + i, length=111.0)
+
+    reduced = reduce_graph(G, dist=3000, dpi=300, simplify_level=2)
+
+    for _, _, geometry in reduced.edges(data='geometry'):
+        if geometry is not None:
+            min_x, min_y, max_x, max_y = geometry.bounds
+            assert 2 < min_x and max_x < 3 and 48 < min_y and max_y < 49, \
+                "Edge geometries should be projected back to lat/lon"
+    assert not reduced.graph.get('simplified'), "Graph flags should be preserved"
+
+    print("✓ test_reduce_graph_consolidation_stays_in_latlon passed")
+
+
+def test_create_poster_reuses_cached_render(monkeypatch, tmp_path):
+    """Test that identical inputs are served from the render cache."""
+    from maptoposter import generator
+
+    def fail_fetch(*args, **kwargs):
+        raise AssertionError("Cached render should not download map data")
+
+    monkeypatch.setattr(generator, 'RENDER_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(generator, 'get_coordinates', lambda city, country: (1.0, 2.0))
+    monkeypatch.setattr(generator, '_fetch_map_data', fail_fetch)
+
+    theme = load_theme('noir')
+    cache_path = generator._render_cache_path('Paris', 'France', (1.0, 2.0), 5000,
+                                              'all', theme, 300)
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, 'wb') as f:
+        f.write(b'poster')
+
+    output_path = str(tmp_path / 'paris.png')
+    result = generator.create_poster('Paris', 'France', 'noir', dist=5000,
+                                     output_path=output_path, verbose=False)
+
+    assert result == output_path
+    with open(output_path, 'rb') as f:
+        assert f.read() == b'poster', "Cached poster should be copied to output"
+
+    other_theme = generator._render_cache_path('Paris', 'France', (1.0, 2.0), 5000,
+                                               'all', load_theme('sunset'), 300)
+    assert other_theme != cache_path, "Cache key should depend on theme"
+
+    small_cache_path = generator._render_cache_path('Paris', 'France', (1.0, 2.0), 5000,
+                                                    'all', theme, 10)
+    with open(small_cache_path, 'wb') as f:
+        f.write(b'poster')
+    uncached_path = str(tmp_path / 'paris_fresh.png')
+    monkeypatch.setattr(generator, '_fetch_map_data', lambda *args, **kwargs: _tiny_map())
+    generator.create_poster('Paris', 'France', 'noir', dist=5000, output_path=uncached_path,
+                            dpi=10, verbose=False, use_cache=False)
+    with open(uncached_path, 'rb') as f:
+        assert f.read() != b'poster', "use_cache=False should render from scratch"
+
+    monkeypatch.setattr(generator, 'RENDER_CACHE_VERSION', generator.RENDER_CACHE_VERSION + 1)
+    bumped = generator._render_cache_path('Paris', 'France', (1.0, 2.0), 5000,
+                                          'all', theme, 300)
+    assert bumped != cache_path, "Cache key should depend on the renderer version"
+
+    print("✓ test_create_poster_reuses_cached_render passed")
+
+
+
+def test_font_props_fallback_is_not_cached(monkeypatch, tmp_path):
+    """Test that missing fonts don't pin the monospace fallback for the process."""
+    from maptoposter import generator
+
+    fonts_dir = os.path.abspath(generator.FONTS_DIR)
+    generator._roboto_font_props.cache_clear()
+    monkeypatch.setattr(generator, 'FONTS_DIR', str(tmp_path))
+    assert generator.get_font_props().main.get_file() is None, "Missing fonts should fall back"
+
+    monkeypatch.setattr(generator, 'FONTS_DIR', fonts_dir)
+    fonts = generator.get_font_props()
+    assert fonts.main.get_file().endswith('Roboto-Bold.ttf'), "Fonts found later should be used"
+    assert generator.get_font_props() is fonts, "Roboto bundle should be built once"
+
+    print("✓ test_font_props_fallback_is_not_cached passed")
+
 if __name__ == "__main__":
     print("Running maptoposter library tests...\n")
     
     test_list_themes()
     test_load_theme()
     test_load_nonexistent_theme()
+    test_load_all_themes()
     
     print("\n✅ All tests passed!")
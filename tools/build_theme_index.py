@@ -7,6 +7,24 @@ Reads all theme files from themes/ and generates site/themes/index.json
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def _read_theme(entry):
+    """Read one theme file into its index entry, or None if unreadable."""
+    theme_id = entry.name[:-5]  # Remove .json extension
+    
+    try:
+        with open(entry.path, 'r') as f:
+            theme_data = json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read {entry.path}: {e}")
+        return None
+    
+    return {
+        "theme": theme_id,
+        "name": theme_data.get("name", theme_id),
+        "description": theme_data.get("description", "")
+    }
 
 def build_theme_index():
     """Generate themes index JSON file."""
@@ -21,28 +39,17 @@ def build_theme_index():
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    # Read all theme files
-    themes = []
-    for filename in sorted(os.listdir(themes_dir)):
-        if not filename.endswith('.json'):
-            continue
-        
-        theme_id = filename[:-5]  # Remove .json extension
-        theme_path = os.path.join(themes_dir, filename)
-        
-        try:
-            with open(theme_path, 'r') as f:
-                theme_data = json.load(f)
-                
-            themes.append({
-                "theme": theme_id,
-                "name": theme_data.get("name", theme_id),
-                "description": theme_data.get("description", "")
-            })
-            
-        except Exception as e:
-            print(f"Warning: Could not read {theme_path}: {e}")
-            continue
+    # Read all theme files (one directory scan, one parse per theme)
+    with os.scandir(themes_dir) as entries:
+        theme_entries = sorted(
+            (entry for entry in entries if entry.name.endswith('.json') and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+    
+    # Parse the theme files concurrently; results keep the sorted order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_read_theme, theme_entries))
+    themes = [theme for theme in results if theme is not None]
     
     # Write index file
     with open(output_file, 'w') as f:
@@ -6,8 +6,15 @@ Creates simple colored rectangles based on theme colors.
 
 import json
 import os
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+def hex_to_rgb(color):
+    """Convert a '#RRGGBB' color to an (r, g, b) tuple."""
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
 def create_placeholder_preview(theme_id, theme_data, output_path):
     """Create a simple placeholder preview image."""
     # Image dimensions (portrait orientation)
@@ -17,18 +24,25 @@ def create_placeholder_preview(theme_id, theme_data, output_path):
     bg_color = theme_data.get('bg', '#FFFFFF')
     road_color = theme_data.get('road_primary', '#000000')
     text_color = theme_data.get('text', '#000000')
+    bg_rgb = hex_to_rgb(bg_color)
+    road_rgb = hex_to_rgb(road_color)
     
-    # Create image
-    img = Image.new('RGB', (width, height), bg_color)
-    draw = ImageDraw.Draw(img)
+    # Fill the whole grid in one go instead of drawing line by line
+    arr = np.full((height, width, 3), bg_rgb, dtype=np.uint8)
     
-    # Draw some simple roads as lines
+    # Draw some simple roads as 3px lines centred on every 30th pixel
     road_width = 3
-    for i in range(0, width, 30):
-        draw.line([(i, 0), (i, height)], fill=road_color, width=road_width)
+    offsets = np.arange(road_width) - road_width // 2
+    cols = (np.arange(0, width, 30)[:, None] + offsets).ravel()
+    rows = (np.arange(0, height, 30)[:, None] + offsets).ravel()
+    arr[:, cols[(cols >= 0) & (cols < width)]] = road_rgb
+    arr[rows[(rows >= 0) & (rows < height)], :] = road_rgb
     
-    for i in range(0, height, 30):
-        draw.line([(0, i), (width, i)], fill=road_color, width=road_width)
+    # Plain background behind the label
+    arr[height - 60:, :] = bg_rgb
+    
+    img = Image.fromarray(arr, 'RGB')
+    draw = ImageDraw.Draw(img)
     
     # Add theme name text at bottom
     try:
@@ -47,12 +61,6 @@ def create_placeholder_preview(theme_id, theme_data, output_path):
     text_x = (width - text_width) // 2
     text_y = height - text_height - 20
     
-    # Draw semi-transparent background for text
-    draw.rectangle(
-        [(0, height - 60), (width, height)],
-        fill=bg_color
-    )
-    
     # Draw text
     draw.text((text_x, text_y), theme_name, fill=text_color, font=font)
     